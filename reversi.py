@@ -2,26 +2,404 @@ import numpy as np
 import random
 import time
 import math
-from copy import deepcopy
+
+try:
+    from numba import njit, prange
+    _u64 = np.uint64
+except ImportError:
+    # numba is optional; without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+    prange = range
+    _u64 = int
+
+# Bitboard layout: bit (row * 8 + col) is set when that square is occupied,
+# so bit 0 is A1 and bit 63 is H8. The constants are numpy uint64 when numba
+# is available so that the compiled kernels never mix signed and unsigned
+# integers.
+FULL_MASK = _u64(0xFFFFFFFFFFFFFFFF)
+INNER_COLUMNS = _u64(0x7E7E7E7E7E7E7E7E)  # Every square except columns A and H
+_ZERO = _u64(0)
+_ONE = _u64(1)
+
+# Constants for the SWAR popcount and the rollout random number generator
+_M1 = _u64(0x5555555555555555)
+_M2 = _u64(0x3333333333333333)
+_M4 = _u64(0x0F0F0F0F0F0F0F0F)
+_H01 = _u64(0x0101010101010101)
+_GOLDEN = _u64(0x9E3779B97F4A7C15)
+
+CORNERS = _u64(0x8100000000000081)  # A1, H1, A8 and H8
+
+# Positional weight of every square, indexed by row * 8 + col. Shared by the
+# minimax evaluation and the rollout move policy.
+WEIGHT_ROW = np.array([
+    120, -20, 20,  5,  5, 20, -20, 120,
+    -20, -40, -5, -5, -5, -5, -40, -20,
+     20,  -5, 15,  3,  3, 15,  -5,  20,
+      5,  -5,  3,  3,  3,  3,  -5,   5,
+      5,  -5,  3,  3,  3,  3,  -5,   5,
+     20,  -5, 15,  3,  3, 15,  -5,  20,
+    -20, -40, -5, -5, -5, -5, -40, -20,
+    120, -20, 20,  5,  5, 20, -20, 120,
+], dtype=np.int64)
+
+# Added to WEIGHT_ROW when picking rollout moves so every move keeps a
+# positive chance of being played
+ROLLOUT_WEIGHT_OFFSET = 50
+
+@njit("uint64(uint64, uint64, uint64, int64)", cache=True, inline='always')
+def line_moves_bb(player_bb, opp_mask, empty, shift):
+    """
+    Return the moves that capture along one line, in both of its directions.
+    
+    Args:
+        player_bb: Bitboard of the player's pieces
+        opp_mask: Bitboard of the opponent pieces a capture can run through.
+            Leaving out the edge columns for horizontal and diagonal lines
+            stops a run from wrapping around to the other side of the board.
+        empty: Bitboard of empty squares
+        shift: The bit distance between neighbouring squares on the line
+    """
+    # Flood through runs of opponent pieces starting next to our own pieces
+    # (at most 6 in a row fit between two squares), then one more step must
+    # land on an empty square
+    x = opp_mask & (player_bb << shift)
+    x |= opp_mask & (x << shift)
+    x |= opp_mask & (x << shift)
+    x |= opp_mask & (x << shift)
+    x |= opp_mask & (x << shift)
+    x |= opp_mask & (x << shift)
+    moves = empty & (x << shift)
+    
+    x = opp_mask & (player_bb >> shift)
+    x |= opp_mask & (x >> shift)
+    x |= opp_mask & (x >> shift)
+    x |= opp_mask & (x >> shift)
+    x |= opp_mask & (x >> shift)
+    x |= opp_mask & (x >> shift)
+    moves |= empty & (x >> shift)
+    
+    return moves
+
+
+@njit("uint64(uint64, uint64)", cache=True)
+def legal_moves_bb(player_bb, opp_bb):
+    """Return a bitboard of every legal move for player_bb against opp_bb."""
+    empty = ~(player_bb | opp_bb) & FULL_MASK
+    inner_opp = opp_bb & INNER_COLUMNS
+    
+    # One call per line direction, each with a constant shift
+    return (line_moves_bb(player_bb, inner_opp, empty, 1) |  # Horizontal
+            line_moves_bb(player_bb, opp_bb, empty, 8) |     # Vertical
+            line_moves_bb(player_bb, inner_opp, empty, 9) |  # Diagonal
+            line_moves_bb(player_bb, inner_opp, empty, 7))   # Anti-diagonal
+
+
+@njit("uint8[:, :, :]()", cache=True)
+def build_line_flips():
+    """
+    Build the flip table for a single line of 8 squares.
+    
+    Entry [pos, player8, opp8] holds the opponent pieces flipped along the
+    line when the player plays on pos, with each line given as 8 bits.
+    Only the 3**8 arrangements where player8 and opp8 do not overlap are
+    filled in.
+    """
+    table = np.zeros((8, 256, 256), dtype=np.uint8)
+    
+    for player8 in range(256):
+        for opp8 in range(256):
+            if player8 & opp8:
+                continue
+            
+            for pos in range(8):
+                if (player8 | opp8) >> pos & 1:
+                    continue
+                
+                flips = 0
+                for step in (1, -1):
+                    # Walk over a run of opponent pieces...
+                    run = 0
+                    x = pos + step
+                    while 0 <= x < 8 and opp8 >> x & 1:
+                        run |= 1 << x
+                        x += step
+                    
+                    # ...which is captured if it ends on one of our own pieces
+                    if 0 <= x < 8 and player8 >> x & 1:
+                        flips |= run
+                
+                table[pos, player8, opp8] = flips
+    
+    return table
+
+
+def line_masks():
+    """Return bitboards of the diagonal and anti-diagonal through every square."""
+    diagonals = np.zeros(64, dtype=np.uint64)
+    anti_diagonals = np.zeros(64, dtype=np.uint64)
+    
+    for square in range(64):
+        row, col = divmod(square, 8)
+        for r in range(8):
+            for c in range(8):
+                if r - c == row - col:
+                    diagonals[square] |= np.uint64(1 << (r * 8 + c))
+                if r + c == row + col:
+                    anti_diagonals[square] |= np.uint64(1 << (r * 8 + c))
+    
+    return diagonals, anti_diagonals
+
+
+# Lookup tables for flipping pieces one line at a time. A line through a
+# square is gathered into 8 bits, indexed by column (or by row for columns),
+# looked up in LINE_FLIPS and scattered back onto the board.
+LINE_FLIPS = build_line_flips()
+DIAGONAL_MASKS, ANTI_DIAGONAL_MASKS = line_masks()
+COLUMN_SPREAD = np.array([sum(((byte >> i) & 1) << (i * 8) for i in range(8)) for byte in range(256)],
+                         dtype=np.uint64)  # Bit i of the index becomes row i of column A
+A_FILE = _u64(0x0101010101010101)
+_BYTE = _u64(0xFF)
+_COLUMN_MAGIC = _u64(0x0102040810204080)  # Gathers column A into the top byte
+
+
+@njit("uint64(uint64, uint64, int64)", cache=True)
+def flips_bb(player_bb, opp_bb, square):
+    """Return a bitboard of the opponent pieces flipped by playing on square."""
+    row = square >> 3
+    col = square & 7
+    
+    # Row: the 8 bits are already contiguous
+    shift = row * 8
+    flips = _u64(LINE_FLIPS[col, (player_bb >> shift) & _BYTE, (opp_bb >> shift) & _BYTE]) << shift
+    
+    # Column: gather it into the top byte with a multiply
+    player8 = (((player_bb >> col) & A_FILE) * _COLUMN_MAGIC & FULL_MASK) >> 56
+    opp8 = (((opp_bb >> col) & A_FILE) * _COLUMN_MAGIC & FULL_MASK) >> 56
+    flips |= _u64(COLUMN_SPREAD[LINE_FLIPS[row, player8, opp8]]) << col
+    
+    # Diagonals hold at most one square per column, so multiplying by
+    # A_FILE stacks them into the top byte and the deposit is the reverse
+    for mask in (_u64(DIAGONAL_MASKS[square]), _u64(ANTI_DIAGONAL_MASKS[square])):
+        player8 = ((player_bb & mask) * A_FILE & FULL_MASK) >> 56
+        opp8 = ((opp_bb & mask) * A_FILE & FULL_MASK) >> 56
+        flips |= (_u64(LINE_FLIPS[col, player8, opp8]) * A_FILE & FULL_MASK) & mask
+    
+    return flips
+
+
+@njit("UniTuple(uint64, 3)(uint64, uint64, int64)", cache=True)
+def make_move_bb(player_bb, opp_bb, square):
+    """
+    Play square for player_bb.
+    
+    Returns:
+        The new (player, opponent) bitboards and the flipped pieces. No
+        pieces are flipped, and the bitboards are unchanged, if the move is
+        not legal.
+    """
+    move = _ONE << square
+    if (player_bb | opp_bb) & move:
+        return player_bb, opp_bb, _ZERO
+    
+    flips = flips_bb(player_bb, opp_bb, square)
+    if not flips:
+        return player_bb, opp_bb, _ZERO
+    
+    return player_bb ^ (flips | move), opp_bb ^ flips, flips
+
+
+@njit("UniTuple(uint64, 2)(uint64, uint64)", cache=True)
+def legal_moves_both_bb(black_bb, white_bb):
+    """Return the (black, white) legal-move bitboards in one call."""
+    return legal_moves_bb(black_bb, white_bb), legal_moves_bb(white_bb, black_bb)
+
+
+@njit("int64(uint64)", cache=True)
+def popcount_bb(bb):
+    """Count the set bits of a bitboard."""
+    bb = bb - ((bb >> 1) & _M1)
+    bb = (bb & _M2) + ((bb >> 2) & _M2)
+    bb = (bb + (bb >> 4)) & _M4
+    return ((bb * _H01) & FULL_MASK) >> 56
+
+
+@njit("uint64(uint64)", cache=True)
+def xorshift64(state):
+    """Advance a xorshift64 random number generator state (must be non-zero)."""
+    state ^= (state << 13) & FULL_MASK
+    state ^= state >> 7
+    state ^= (state << 17) & FULL_MASK
+    return state
+
+
+@njit("int64(uint64, uint64)", cache=True)
+def choose_rollout_move(moves, state):
+    """
+    Pick the square to play in a rollout from a non-empty legal-move bitboard.
+    
+    A corner is always taken when one is available. Otherwise a move is drawn
+    at random, weighted by its positional weight plus ROLLOUT_WEIGHT_OFFSET,
+    so rollouts rarely give corners away through the squares next to them.
+    """
+    corners = moves & CORNERS
+    if corners:
+        return popcount_bb((corners & (~corners + _ONE)) - _ONE)
+    
+    total = 0
+    remaining = moves
+    while remaining:
+        square = popcount_bb((remaining & (~remaining + _ONE)) - _ONE)
+        total += WEIGHT_ROW[square] + ROLLOUT_WEIGHT_OFFSET
+        remaining &= remaining - _ONE
+    
+    pick = int(state % _u64(total))
+    while True:
+        square = popcount_bb((moves & (~moves + _ONE)) - _ONE)
+        pick -= WEIGHT_ROW[square] + ROLLOUT_WEIGHT_OFFSET
+        if pick < 0:
+            return square
+        moves &= moves - _ONE
+
+
+@njit("int8[:](uint64, uint64, int64, int64, uint64)", parallel=True, cache=True)
+def rollout_batch_bb(black_bb, white_bb, side, n_rollouts, seed):
+    """
+    Play n_rollouts games to the end from the same position, with moves
+    chosen by choose_rollout_move.
+    
+    The games are independent, so they run in parallel, each with its own
+    random number generator derived from seed.
+    
+    Args:
+        black_bb: Bitboard of black pieces
+        white_bb: Bitboard of white pieces
+        side: The player to move (1 for black, 2 for white)
+        n_rollouts: Number of games to play
+        seed: Seed for the random number generators
+        
+    Returns:
+        An int8 array holding the winner of every game (0 for a draw)
+    """
+    winners = np.zeros(n_rollouts, dtype=np.int8)
+    
+    for lane in prange(n_rollouts):
+        state = xorshift64((seed ^ ((_u64(lane + 1) * _GOLDEN) & FULL_MASK)) | _ONE)
+        black = black_bb
+        white = white_bb
+        player = side
+        
+        while True:
+            if player == 1:
+                player_bb, opp_bb = black, white
+            else:
+                player_bb, opp_bb = white, black
+            
+            moves = legal_moves_bb(player_bb, opp_bb)
+            if not moves:
+                if not legal_moves_bb(opp_bb, player_bb):
+                    break  # Game over
+                
+                # No valid moves, switch players
+                player = 3 - player
+                continue
+            
+            state = xorshift64(state)
+            square = choose_rollout_move(moves, state)
+            
+            player_bb, opp_bb, _ = make_move_bb(player_bb, opp_bb, square)
+            if player == 1:
+                black, white = player_bb, opp_bb
+            else:
+                white, black = player_bb, opp_bb
+            player = 3 - player
+        
+        black_count = popcount_bb(black)
+        white_count = popcount_bb(white)
+        if black_count > white_count:
+            winners[lane] = 1
+        elif white_count > black_count:
+            winners[lane] = 2
+    
+    return winners
+
+
+# Zobrist keys: one random 64-bit number per (player, square), plus one for
+# white to move. A private generator keeps the keys stable between runs and
+# leaves the global random state used by MCTS alone.
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST_BLACK = tuple(_zobrist_rng.getrandbits(64) for _ in range(64))
+ZOBRIST_WHITE = tuple(_zobrist_rng.getrandbits(64) for _ in range(64))
+ZOBRIST_FLIP = tuple(b ^ w for b, w in zip(ZOBRIST_BLACK, ZOBRIST_WHITE))
+ZOBRIST_SIDE = _zobrist_rng.getrandbits(64)
+
+
+def bb_to_moves(bb):
+    """Convert a bitboard into a list of (row, col) tuples in board-scan order."""
+    moves = []
+    while bb:
+        lsb = bb & -bb
+        moves.append(divmod(lsb.bit_length() - 1, 8))
+        bb ^= lsb
+    return moves
+
+
+def weight_classes_bb(weights):
+    """Group the squares of an 8x8 weight matrix into (weight, bitboard) pairs."""
+    classes = {}
+    for square, weight in enumerate(weights.flatten().tolist()):
+        classes[weight] = classes.get(weight, 0) | 1 << square
+    return tuple(classes.items())
+
 
 class ReversiBoard:
     """
     A class representing the Reversi game board and rules.
-    """
-    # Direction vectors for checking in all 8 directions
-    DIRECTIONS = [(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)]
     
+    The position is stored as two 64-bit bitboards, one per player.
+    """
     def __init__(self, size=8):
+        if size != 8:
+            raise ValueError("The bitboard representation only supports an 8x8 board")
+        
         self.size = size
-        self.board = np.zeros((size, size), dtype=int)
+        self.black = 0  # Bitboard of black pieces
+        self.white = 0  # Bitboard of white pieces
         self.current_player = 1  # 1 for black, 2 for white
         
         # Initialize the starting position
         mid = size // 2
-        self.board[mid-1][mid-1] = 2  # White
-        self.board[mid][mid] = 2      # White
-        self.board[mid-1][mid] = 1    # Black
-        self.board[mid][mid-1] = 1    # Black
+        self.white |= 1 << ((mid-1) * 8 + mid-1)  # White
+        self.white |= 1 << (mid * 8 + mid)        # White
+        self.black |= 1 << ((mid-1) * 8 + mid)    # Black
+        self.black |= 1 << (mid * 8 + mid-1)      # Black
+        
+        # Zobrist hash of the pieces, updated incrementally by make_move
+        self.zobrist = 0
+        for square in range(64):
+            if self.black >> square & 1:
+                self.zobrist ^= ZOBRIST_BLACK[square]
+            elif self.white >> square & 1:
+                self.zobrist ^= ZOBRIST_WHITE[square]
+        
+        # Legal-move bitboards per player, filled in for both players on
+        # demand and cleared whenever the pieces change
+        self._legal_cache = {1: None, 2: None}
+
+    @property
+    def board(self):
+        """
+        The board as a size x size numpy array (0 empty, 1 black, 2 white).
+        
+        The array is built from the bitboards on every access, so hot paths
+        should work on the bitboards directly.
+        """
+        black = np.unpackbits(np.array([self.black], dtype='<u8').view(np.uint8), bitorder='little')
+        white = np.unpackbits(np.array([self.white], dtype='<u8').view(np.uint8), bitorder='little')
+        return (black + 2 * white).astype(np.int8).reshape(self.size, self.size)
 
     def get_opponent(self, player):
         """Return the opponent's number."""
@@ -31,108 +409,100 @@ class ReversiBoard:
         """Check if a position is on the board."""
         return 0 <= row < self.size and 0 <= col < self.size
     
+    def zobrist_key(self):
+        """Return the Zobrist hash of the position, including the side to move."""
+        if self.current_player == 2:
+            return self.zobrist ^ ZOBRIST_SIDE
+        return self.zobrist
+    
+    def get_bitboards(self, player):
+        """Return the (player, opponent) bitboards for the given player."""
+        if player == 1:
+            return self.black, self.white
+        return self.white, self.black
+    
     def count_pieces(self):
         """Count the number of pieces for each player."""
-        black_count = np.sum(self.board == 1)
-        white_count = np.sum(self.board == 2)
+        black_count = self.black.bit_count()
+        white_count = self.white.bit_count()
         return black_count, white_count
     
-    def get_valid_moves(self, player=None):
-        """Get all valid moves for the given player."""
+    def get_legal_bb(self, player=None):
+        """Get a bitboard of all valid moves for the given player."""
         if player is None:
             player = self.current_player
         
-        valid_moves = []
-        
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.is_valid_move(row, col, player):
-                    valid_moves.append((row, col))
+        legal = self._legal_cache[player]
+        if legal is None:
+            self._compute_legal()
+            legal = self._legal_cache[player]
         
-        return valid_moves
+        return legal
+    
+    def _compute_legal(self):
+        """Fill the legal-move cache for both players at once."""
+        black_moves, white_moves = legal_moves_both_bb(self.black, self.white)
+        self._legal_cache[1] = black_moves
+        self._legal_cache[2] = white_moves
+    
+    def get_valid_moves(self, player=None):
+        """Get all valid moves for the given player."""
+        return bb_to_moves(self.get_legal_bb(player))
     
     def is_valid_move(self, row, col, player=None):
         """Check if a move is valid for the given player."""
         if player is None:
             player = self.current_player
-            
-        # Cell must be empty
-        if self.board[row][col] != 0:
-            return False
         
-        opponent = self.get_opponent(player)
+        square = row * 8 + col
         
-        # Check in all eight directions
-        for dx, dy in self.DIRECTIONS:
-            r, c = row + dx, col + dy
-            
-            # There must be at least one opponent piece in this direction
-            if not (self.is_on_board(r, c) and self.board[r][c] == opponent):
-                continue
-                
-            # Continue in this direction
-            r += dx
-            c += dy
-            
-            # Keep going until we find an empty cell or go off the board
-            while self.is_on_board(r, c) and self.board[r][c] != 0:
-                # If we find our own piece, this is a valid move
-                if self.board[r][c] == player:
-                    return True
-                    
-                r += dx
-                c += dy
+        # Cell must be empty
+        if (self.black | self.white) >> square & 1:
+            return False
         
-        return False
+        player_bb, opp_bb = self.get_bitboards(player)
+        return flips_bb(player_bb, opp_bb, square) != 0
     
     def make_move(self, row, col, player=None):
         """Make a move for the given player."""
         if player is None:
             player = self.current_player
-            
-        if not self.is_valid_move(row, col, player):
-            return False
         
-        # Place the piece
-        self.board[row][col] = player
+        # make_move_bb leaves the bitboards unchanged for an invalid move
+        square = row * 8 + col
+        if player == 1:
+            self.black, self.white, flips = make_move_bb(self.black, self.white, square)
+            if not flips:
+                return False
+            self.zobrist ^= ZOBRIST_BLACK[square]
+        else:
+            self.white, self.black, flips = make_move_bb(self.white, self.black, square)
+            if not flips:
+                return False
+            self.zobrist ^= ZOBRIST_WHITE[square]
         
-        # Flip opponent pieces
-        opponent = self.get_opponent(player)
-        pieces_to_flip = []
+        # Every flipped piece swaps its key from one player to the other
+        while flips:
+            lsb = flips & -flips
+            self.zobrist ^= ZOBRIST_FLIP[lsb.bit_length() - 1]
+            flips ^= lsb
         
-        for dx, dy in self.DIRECTIONS:
-            r, c = row + dx, col + dy
-            temp_flip = []
-            
-            # Check if there are opponent pieces to flip in this direction
-            while self.is_on_board(r, c) and self.board[r][c] == opponent:
-                temp_flip.append((r, c))
-                r += dx
-                c += dy
-                
-            # If we reached one of our own pieces, flip all pieces in between
-            if self.is_on_board(r, c) and self.board[r][c] == player:
-                pieces_to_flip.extend(temp_flip)
+        self._legal_cache = {1: None, 2: None}
         
-        # Flip all captured pieces
-        for r, c in pieces_to_flip:
-            self.board[r][c] = player
-            
         # Switch players for next turn
-        self.current_player = self.get_opponent(player)
+        self.current_player = 3 - player
         
         return True
     
     def has_valid_moves(self, player=None):
         """Check if the player has any valid moves."""
-        if player is None:
-            player = self.current_player
-            
-        return len(self.get_valid_moves(player)) > 0
+        return self.get_legal_bb(player) != 0
     
     def is_game_over(self):
         """Check if the game is over."""
-        return not (self.has_valid_moves(1) or self.has_valid_moves(2))
+        if self._legal_cache[1] is None:
+            self._compute_legal()
+        return not self._legal_cache[1] and not self._legal_cache[2]
     
     def get_winner(self):
         """Get the winner of the game."""
@@ -145,25 +515,44 @@ class ReversiBoard:
         else:
             return 0  # Draw
     
+    def save_state(self):
+        """Return a snapshot of the position that unmake_move can restore."""
+        return self.black, self.white, self.current_player, self.zobrist
+    
+    def unmake_move(self, state):
+        """Restore a position previously returned by save_state."""
+        self.black, self.white, self.current_player, self.zobrist = state
+        self._legal_cache = {1: None, 2: None}
+    
     def copy(self):
-        """Create a deep copy of the board."""
-        new_board = ReversiBoard(self.size)
-        new_board.board = deepcopy(self.board)
+        """Create a copy of the board."""
+        # Skip __init__, which would set up and hash the starting position
+        # only for it to be overwritten
+        new_board = ReversiBoard.__new__(ReversiBoard)
+        new_board.size = self.size
+        new_board.black = self.black
+        new_board.white = self.white
         new_board.current_player = self.current_player
+        new_board.zobrist = self.zobrist
+        new_board._legal_cache = dict(self._legal_cache)
         return new_board
     
-    def print_board(self, highlighted_pos=None):
+    def print_board(self, highlighted_pos=None, valid_moves=None):
         """
         Print the current board state with a nicer display.
         
         Args:
             highlighted_pos: Optional (row, col) tuple to highlight a position
+            valid_moves: Optional list of valid moves for the current player,
+                computed here if not given
         """
         # Clear the screen first (works on most terminals)
         print("\033c", end="")
         
         # Get valid moves for current player to mark with asterisk
-        valid_moves = self.get_valid_moves()
+        if valid_moves is None:
+            valid_moves = self.get_valid_moves()
+        board = self.board
         
         # Print column headers (A through H)
         col_headers = "    " + "   ".join([chr(65 + i) for i in range(self.size)])
@@ -177,9 +566,9 @@ class ReversiBoard:
             row_str = f"{i+1} |"
             for j in range(self.size):
                 # Determine cell content
-                if self.board[i][j] == 1:
+                if board[i, j] == 1:
                     cell = "1"  # Black
-                elif self.board[i][j] == 2:
+                elif board[i, j] == 2:
                     cell = "0"  # White
                 elif (i, j) in valid_moves:
                     cell = "*"  # Valid move
@@ -204,21 +593,30 @@ class MinimaxPlayer:
     """
     AI player using Minimax algorithm with Alpha-Beta pruning.
     """
+    # Transposition table size (a power of two) and entry flags
+    TT_SIZE = 2 ** 20
+    EXACT = 0        # The stored value is the exact minimax value
+    LOWER_BOUND = 1  # The search failed high; the real value is at least this
+    UPPER_BOUND = 2  # The search failed low; the real value is at most this
+    
+    # Half-width of the aspiration window around the previous iteration's score
+    ASPIRATION_WINDOW = 25
+    
+    # Weights for the board evaluation
+    WEIGHTS = WEIGHT_ROW.reshape(8, 8)
+    
+    # The same weights as (weight, bitboard of squares with that weight) pairs
+    WEIGHT_CLASSES = weight_classes_bb(WEIGHTS)
+    
     def __init__(self, player_number, depth=4):
         self.player_number = player_number
         self.depth = depth
+        self.weights = self.WEIGHTS
         
-        # Weights for the board evaluation
-        self.weights = np.array([
-            [120, -20, 20,  5,  5, 20, -20, 120],
-            [-20, -40, -5, -5, -5, -5, -40, -20],
-            [ 20,  -5, 15,  3,  3, 15,  -5,  20],
-            [  5,  -5,  3,  3,  3,  3,  -5,   5],
-            [  5,  -5,  3,  3,  3,  3,  -5,   5],
-            [ 20,  -5, 15,  3,  3, 15,  -5,  20],
-            [-20, -40, -5, -5, -5, -5, -40, -20],
-            [120, -20, 20,  5,  5, 20, -20, 120]
-        ])
+        # Transposition table of (key, depth, flag, value, best_move) entries,
+        # indexed by the low bits of the Zobrist key. Values are always from
+        # this player's perspective, so entries stay valid between moves.
+        self.transposition_table = [None] * self.TT_SIZE
     
     def get_move(self, board):
         """Get the best move using Minimax with Alpha-Beta pruning."""
@@ -231,26 +629,89 @@ class MinimaxPlayer:
         if len(valid_moves) == 1:
             return valid_moves[0]
         
-        best_value = float('-inf')
-        best_move = None
+        # Search from our own point of view
+        saved = board.save_state()
+        board.current_player = self.player_number
+        
+        # Iterative deepening: each iteration leaves its best move in the
+        # transposition table for the next one to search first, and its score
+        # centres the aspiration window of the next iteration
         alpha = float('-inf')
         beta = float('inf')
+        for depth in range(1, self.depth + 1):
+            score, best_move = self._search(board, depth, alpha, beta)
+            
+            if score <= alpha or score >= beta:
+                # The score fell outside the window; search again with a full one
+                score, best_move = self._search(board, depth, float('-inf'), float('inf'))
+            
+            alpha = score - self.ASPIRATION_WINDOW
+            beta = score + self.ASPIRATION_WINDOW
+        
+        board.unmake_move(saved)
+        return best_move
+    
+    def _search(self, board, depth, alpha, beta):
+        """
+        Search the root position to the given depth.
+        
+        Returns:
+            A (score, move) tuple for the best move found
+        """
+        key = board.zobrist_key()
+        entry = self.transposition_table[key & (self.TT_SIZE - 1)]
+        hash_move = entry[4] if entry is not None and entry[0] == key else None
+        
+        original_alpha = alpha
+        best_value = float('-inf')
+        best_move = None
         
-        for move in valid_moves:
-            # Make a copy of the board and make the move
-            board_copy = board.copy()
-            board_copy.make_move(move[0], move[1], self.player_number)
+        for move in self.order_moves(board.get_valid_moves(self.player_number), hash_move):
+            # Make the move in place and undo it once it has been searched
+            saved = board.save_state()
+            board.make_move(move[0], move[1], self.player_number)
             
             # Get the value of this move
-            value = self.minimax(board_copy, self.depth - 1, alpha, beta, False)
+            value = self.minimax(board, depth - 1, alpha, beta, False)
+            board.unmake_move(saved)
             
             if value > best_value:
                 best_value = value
                 best_move = move
                 
             alpha = max(alpha, best_value)
+            if beta <= alpha:
+                break  # Fail high; the caller will search again
         
-        return best_move
+        self._store(key, depth, best_value, original_alpha, beta, best_move)
+        return best_value, best_move
+    
+    def _store(self, key, depth, value, alpha, beta, best_move):
+        """Store a search result, flagged by where it fell relative to the window."""
+        if value <= alpha:
+            flag = self.UPPER_BOUND
+        elif value >= beta:
+            flag = self.LOWER_BOUND
+        else:
+            flag = self.EXACT
+        self.transposition_table[key & (self.TT_SIZE - 1)] = (key, depth, flag, value, best_move)
+    
+    def order_moves(self, valid_moves, hash_move=None):
+        """
+        Order moves so that alpha-beta finds the likely best move first.
+        
+        The hash move from the transposition table goes first, followed by the
+        remaining moves from the best square to the worst by positional weight.
+        The weights score a square for whoever occupies it, so the same order
+        suits both the maximizing and the minimizing side.
+        """
+        ordered = sorted(valid_moves, key=lambda m: -self.weights[m[0], m[1]])
+        
+        if hash_move in ordered:
+            ordered.remove(hash_move)
+            ordered.insert(0, hash_move)
+        
+        return ordered
     
     def minimax(self, board: ReversiBoard, depth, alpha, beta, is_maximizing):
         """
@@ -269,45 +730,77 @@ class MinimaxPlayer:
         if depth == 0 or board.is_game_over():
             return self.evaluate(board)
         
+        # Probe the transposition table
+        key = board.zobrist_key()
+        index = key & (self.TT_SIZE - 1)
+        entry = self.transposition_table[index]
+        entry_depth = -1
+        hash_move = None
+        if entry is not None and entry[0] == key:
+            _, entry_depth, flag, value, hash_move = entry
+        if entry_depth >= depth:
+            if flag == self.EXACT:
+                return value
+            elif flag == self.LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if beta <= alpha:
+                return value
+        
+        original_alpha, original_beta = alpha, beta
         current_player = self.player_number if is_maximizing else 3 - self.player_number
-        valid_moves = board.get_valid_moves(current_player)
+        valid_moves = self.order_moves(board.get_valid_moves(current_player), hash_move)
+        best_move = None
         
         if not valid_moves:
             # If the current player has no valid moves, pass to the opponent
-            board_copy = board.copy()
-            board_copy.current_player = 3 - current_player
-            return self.minimax(board_copy, depth - 1, alpha, beta, not is_maximizing)
-        
-        if is_maximizing:
-            max_eval = float('-inf')
+            saved = board.save_state()
+            board.current_player = 3 - current_player
+            best_eval = self.minimax(board, depth - 1, alpha, beta, not is_maximizing)
+            board.unmake_move(saved)
+        elif is_maximizing:
+            best_eval = float('-inf')
             for move in valid_moves:
-                board_copy = board.copy()
-                board_copy.make_move(move[0], move[1], current_player)
-                eval = self.minimax(board_copy, depth - 1, alpha, beta, False)
-                max_eval = max(max_eval, eval)
+                saved = board.save_state()
+                board.make_move(move[0], move[1], current_player)
+                eval = self.minimax(board, depth - 1, alpha, beta, False)
+                board.unmake_move(saved)
+                if eval > best_eval:
+                    best_eval = eval
+                    best_move = move
                 alpha = max(alpha, eval)
                 if beta <= alpha:
                     break  # Beta cutoff
-            return max_eval
         else:
-            min_eval = float('inf')
+            best_eval = float('inf')
             for move in valid_moves:
-                board_copy = board.copy()
-                board_copy.make_move(move[0], move[1], current_player)
-                eval = self.minimax(board_copy, depth - 1, alpha, beta, True)
-                min_eval = min(min_eval, eval)
+                saved = board.save_state()
+                board.make_move(move[0], move[1], current_player)
+                eval = self.minimax(board, depth - 1, alpha, beta, True)
+                board.unmake_move(saved)
+                if eval < best_eval:
+                    best_eval = eval
+                    best_move = move
                 beta = min(beta, eval)
                 if beta <= alpha:
                     break  # Alpha cutoff
-            return min_eval
+        
+        self._store(key, depth, best_eval, original_alpha, original_beta, best_move)
+        
+        return best_eval
     
     def evaluate(self, board):
         """
         Evaluate the current board state from the perspective of this player.
         Higher scores are better for this player.
         """
+        my_bb, opp_bb = board.get_bitboards(self.player_number)
+        my_moves = board.get_legal_bb(self.player_number)
+        opp_moves = board.get_legal_bb(3 - self.player_number)
+        
         # If the game is over, return a high value if we won, low if we lost
-        if board.is_game_over():
+        if not my_moves and not opp_moves:
             winner = board.get_winner()
             if winner == self.player_number:
                 return 10000  # We won
@@ -316,51 +809,60 @@ class MinimaxPlayer:
             else:
                 return -10000  # We lost
         
-        # Use a weighted matrix for position evaluation
-        my_pieces = np.zeros((board.size, board.size), dtype=bool)
-        opponent_pieces = np.zeros((board.size, board.size), dtype=bool)
-        
-        for i in range(board.size):
-            for j in range(board.size):
-                if board.board[i][j] == self.player_number:
-                    my_pieces[i][j] = True
-                elif board.board[i][j] == 3 - self.player_number:
-                    opponent_pieces[i][j] = True
-        
-        # Calculate positional score
-        my_score = np.sum(self.weights[my_pieces])
-        opponent_score = np.sum(self.weights[opponent_pieces])
+        # Calculate positional score, one popcount per group of equally
+        # weighted squares
+        positional_score = 0
+        for weight, mask in self.WEIGHT_CLASSES:
+            positional_score += weight * ((my_bb & mask).bit_count() - (opp_bb & mask).bit_count())
         
         # Calculate mobility score (number of valid moves)
-        my_mobility = len(board.get_valid_moves(self.player_number))
-        opponent_mobility = len(board.get_valid_moves(3 - self.player_number))
+        mobility_score = my_moves.bit_count() - opp_moves.bit_count()
         
         # Combine scores with different weights
         positional_weight = 10
         mobility_weight = 5
         
-        total_score = (positional_weight * (my_score - opponent_score) + 
-                      mobility_weight * (my_mobility - opponent_mobility))
+        total_score = (positional_weight * positional_score + 
+                      mobility_weight * mobility_score)
         
         return total_score
 
 
 class MonteCarloNode:
-    """A node in the Monte Carlo Search Tree."""
-    def __init__(self, board: ReversiBoard, parent=None, move=None):
-        self.board = board
+    """
+    A node in the Monte Carlo Search Tree.
+    
+    The position is kept as bare bitboards rather than a ReversiBoard, so
+    expanding a node allocates nothing but the node itself.
+    """
+    # No per-instance __dict__; a search creates one node per iteration
+    __slots__ = ('black', 'white', 'side', 'parent', 'move', 'children', 'wins', 'visits',
+                 'untried_moves')
+    
+    def __init__(self, black, white, side, parent=None, move=None):
+        self.black = black  # Bitboard of black pieces
+        self.white = white  # Bitboard of white pieces
+        self.side = side    # The player to move
         self.parent = parent
         self.move = move  # The move that led to this board state
         self.children: list[MonteCarloNode] = []
         self.wins = 0
         self.visits = 0
-        self.untried_moves = board.get_valid_moves()
+        
+        if side == 1:
+            self.untried_moves = bb_to_moves(legal_moves_bb(black, white))
+        else:
+            self.untried_moves = bb_to_moves(legal_moves_bb(white, black))
     
     def select_child(self):
         """Select a child node using UCB1 formula."""
         # UCB1 formula: wins/visits + C * sqrt(ln(parent visits) / visits)
         C = 1.41  # Exploration parameter
         
+        # The parent's part of the exploration term is the same for every
+        # child, so compute it once
+        exploration_scale = C * math.sqrt(math.log(self.visits))
+        
         best_score = float('-inf')
         best_child = None
         
@@ -370,7 +872,7 @@ class MonteCarloNode:
                 score = float('inf')
             else:
                 exploitation = child.wins / child.visits
-                exploration = C * math.sqrt(math.log(self.visits) / child.visits)
+                exploration = exploration_scale / math.sqrt(child.visits)
                 score = exploitation + exploration
             
             if score > best_score:
@@ -381,18 +883,21 @@ class MonteCarloNode:
     
     def add_child(self, move):
         """Add a child node with the given move."""
-        board_copy = self.board.copy()
-        board_copy.make_move(move[0], move[1])
+        square = move[0] * 8 + move[1]
+        if self.side == 1:
+            black, white, _ = make_move_bb(self.black, self.white, square)
+        else:
+            white, black, _ = make_move_bb(self.white, self.black, square)
         
-        child = MonteCarloNode(board_copy, parent=self, move=move)
+        child = MonteCarloNode(black, white, 3 - self.side, parent=self, move=move)
         self.untried_moves.remove(move)
         self.children.append(child)
         
         return child
     
-    def update(self, result):
-        """Update this node with a simulation result."""
-        self.visits += 1
+    def update(self, result, visits=1):
+        """Update this node with the total result of one or more simulations."""
+        self.visits += visits
         self.wins += result
 
 
@@ -400,9 +905,10 @@ class MCTSPlayer:
     """
     AI player using Monte Carlo Tree Search.
     """
-    def __init__(self, player_number, iterations=1000):
+    def __init__(self, player_number, iterations=1000, batch_size=32):
         self.player_number = player_number
         self.iterations = iterations
+        self.batch_size = batch_size  # Random games played per expansion
     
     def get_move(self, board):
         """Get the best move using Monte Carlo Tree Search."""
@@ -415,11 +921,8 @@ class MCTSPlayer:
         if len(valid_moves) == 1:
             return valid_moves[0]
         
-        # Create the root node
-        board_copy = board.copy()
-        # Make sure it's our turn
-        board_copy.current_player = self.player_number
-        root = MonteCarloNode(board_copy)
+        # Create the root node, making sure it's our turn
+        root = MonteCarloNode(board.black, board.white, self.player_number)
         
         # Run MCTS iterations
         for _ in range(self.iterations):
@@ -433,29 +936,17 @@ class MCTSPlayer:
                 move = random.choice(node.untried_moves)
                 node = node.add_child(move)
             
-            # Simulation: Play a random game from this node
-            board_copy = node.board.copy()
-            while not board_copy.is_game_over():
-                valid_moves = board_copy.get_valid_moves()
-                if not valid_moves:
-                    # If no valid moves, switch players
-                    board_copy.current_player = 3 - board_copy.current_player
-                    continue
-                
-                random_move = random.choice(valid_moves)
-                board_copy.make_move(random_move[0], random_move[1])
+            # Simulation: Play a batch of random games from this node
+            # in parallel
+            winners = rollout_batch_bb(node.black, node.white, node.side,
+                                       self.batch_size, random.getrandbits(64))
             
-            # Backpropagation: Update all nodes in the path
-            winner = board_copy.get_winner()
+            # Backpropagation: Update all nodes in the path, scoring 1 for
+            # each game we won and 0.5 for each draw
+            result = (np.count_nonzero(winners == self.player_number) +
+                      0.5 * np.count_nonzero(winners == 0))
             while node:
-                if winner == self.player_number:
-                    result = 1.0  # We won
-                elif winner == 0:
-                    result = 0.5  # Draw
-                else:
-                    result = 0.0  # We lost
-                
-                node.update(result)
+                node.update(result, self.batch_size)
                 node = node.parent
         
         # Choose the move with the highest number of visits
@@ -589,7 +1080,7 @@ def play_interactive_game():
                 current_idx = 0
                 highlight_pos = valid_moves[current_idx]
                 
-                board.print_board(highlight_pos)
+                board.print_board(highlight_pos, valid_moves)
                 print(f"Your turn ({'Black' if human_player == 1 else 'White'})")
                 print(f"Move {current_idx + 1}/{len(valid_moves)}: {chr(65 + highlight_pos[1])}{highlight_pos[0] + 1}")
                 print("Use LEFT/RIGHT arrows to cycle through valid moves, ENTER to confirm")
@@ -612,12 +1103,12 @@ def play_interactive_game():
                         break
                     
                     # Update the display
-                    board.print_board(highlight_pos)
+                    board.print_board(highlight_pos, valid_moves)
                     print(f"Your turn ({'Black' if human_player == 1 else 'White'})")
                     print(f"Move {current_idx + 1}/{len(valid_moves)}: {chr(65 + highlight_pos[1])}{highlight_pos[0] + 1}")
                     print("Use LEFT/RIGHT arrows to cycle through valid moves, ENTER to confirm")
             else:
-                board.print_board()
+                board.print_board(valid_moves=valid_moves)
                 print("You have no valid moves. Passing...")
                 print("Press any key to continue (or Q to quit)...")
                 if get_key_windows is not None:
@@ -632,7 +1123,7 @@ def play_interactive_game():
                         return  # Exit the function to quit the game
                 board.current_player = 3 - board.current_player
         else:
-            board.print_board()
+            board.print_board(valid_moves=valid_moves)
             if valid_moves:
                 print(f"AI ({ai_name}) is thinking...")
                 # Give the player a chance to see the board before AI moves
@@ -641,7 +1132,7 @@ def play_interactive_game():
                 print(f"AI plays: {coord_to_algebraic(move[0], move[1])}")
                 
                 # Highlight the AI's move temporarily
-                board.print_board(move)
+                board.print_board(move, valid_moves)
                 print(f"AI ({ai_name}) plays: {coord_to_algebraic(move[0], move[1])}")
                 print("Press any key to continue (or Q to quit)...")
                 